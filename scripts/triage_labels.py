@@ -14,19 +14,127 @@ Env:
   PER_REPO_LIMIT    Max open issues per repo to consider (default: 30)
   SKIP_ARCHIVED     "1" to skip archived repos
   SKIP_FORKS        "1" to skip forks
+  TRIAGE_CONCURRENCY  Max repos processed in parallel (default: 8)
+  TRIAGE_CACHE_DIR    Where to keep state between runs
+                      (default: $RUNNER_TEMP/openclaw-triage or ~/.cache/openclaw-triage)
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from itertools import islice
+from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import requests
+import httpx
+
+# orjson parses large issue payloads several times faster than the stdlib;
+# it is optional so the script still runs with only httpx installed.
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 API = "https://api.github.com"
+GRAPHQL_URL = f"{API}/graphql"
+
+# One round-trip returns a page of repos together with the ids of our labels.
+# GraphQL has no name-prefix filter, so that is applied client-side in
+# fetch_triage_data_graphql().
+TRIAGE_QUERY = """
+query($login: String!, $cursor: String, $isFork: Boolean, $isArchived: Boolean) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: 100
+      after: $cursor
+      ownerAffiliations: [OWNER]
+      isFork: $isFork
+      isArchived: $isArchived
+      orderBy: {field: NAME, direction: ASC}
+    ) {
+      nodes {
+        name
+        security: label(name: "security") { id }
+        bug: label(name: "bug") { id }
+        needsTriage: label(name: "needs-triage") { id }
+      }
+      pageInfo { endCursor hasNextPage }
+    }
+  }
+}
+"""
+
+TRIAGE_ISSUE_FIELDS = """
+fragment TriageIssue on Issue {
+  id
+  number
+  title
+  body
+  labels(first: 20) { nodes { name } }
+}
+"""
+
+# Open issues come from the search API on both paths: unlike the issues
+# connection it can exclude labels, so PRs and already-triaged issues are
+# dropped server-side and PER_REPO_LIMIT is only spent on issues that still
+# need a label. The first page for ISSUE_SEARCH_BATCH repos is fetched per
+# request as aliased search fields (r0, r1, ...); repos with more results
+# than one page holds get follow-up SEARCH_ISSUES_QUERY pages.
+SEARCH_ISSUES_QUERY = TRIAGE_ISSUE_FIELDS + """
+query($q: String!, $n: Int!, $cursor: String) {
+  search(type: ISSUE, query: $q, first: $n, after: $cursor) {
+    nodes { ...TriageIssue }
+    pageInfo { endCursor hasNextPage }
+  }
+}
+"""
+ISSUE_SEARCH_BATCH = 20
+
+# GraphQL field alias used in TRIAGE_QUERY for each of our labels.
+LABEL_ALIASES = {"security": "security", "bug": "bug", "needs-triage": "needsTriage"}
+
+# Matches the rel="next" entry of a Link header in one pass. Splitting the
+# header on "," first would break on cursors that contain commas.
+_NEXT_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
+# api_call() starts pacing requests once fewer than RATE_LIMIT_FLOOR remain
+# in the current window (or RATE_LIMIT_FLOOR_FRACTION of X-RateLimit-Limit,
+# if lower, so the 30-request search limit is not paced on every call), and
+# retries rate-limited answers RATE_LIMIT_RETRIES times. To fit the
+# workflow's 10-minute timeout a single wait is never longer than
+# RATE_LIMIT_MAX_WAIT seconds and pacing sleeps at most
+# RATE_LIMIT_PACING_BUDGET seconds per run; past either, the call fails fast.
+RATE_LIMIT_FLOOR = 50
+RATE_LIMIT_FLOOR_FRACTION = 0.1
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_MAX_WAIT = 60
+RATE_LIMIT_PACING_BUDGET = 120
+
+# The search API has its own, much lower limit (30 requests per minute).
+# api_call() spaces search requests evenly across all worker threads so the
+# run stays under it however many repos there are.
+SEARCH_REQUESTS_PER_MINUTE = 30
+SEARCH_URL_PREFIX = f"{API}/search/"
+
+# process_repo() skip reason for repos given up on because of rate limiting;
+# main() reports these separately from repos we have no access to.
+RATE_LIMITED = "rate limited"
+
+# addLabelsToLabelable mutations sent per GraphQL request; keeps each
+# request well under GitHub's per-request node/cost limits.
+ADD_LABELS_BATCH = 20
 
 SECURITY_KEYWORDS = [
     "security",
@@ -53,6 +161,7 @@ BUG_KEYWORDS = [
     "broken",
 ]
 
+
 LABELS = {
     "security": {"color": "b60205", "description": "Security-related issue"},
     "bug": {"color": "d73a4a", "description": "Something isn't working"},
@@ -60,11 +169,15 @@ LABELS = {
 }
 
 
-@dataclass
-class Counts:
-    security: int = 0
-    bug: int = 0
-    needs_triage: int = 0
+# Label counts are plain [security, bug, needs-triage] lists indexed via
+# CAT_IDX, so tallying an issue is a single indexed add with no branching.
+Counts = List[int]
+SECURITY, BUG, NEEDS_TRIAGE = range(3)
+CAT_IDX = {"security": SECURITY, "bug": BUG, "needs-triage": NEEDS_TRIAGE}
+
+
+def new_counts() -> Counts:
+    return [0, 0, 0]
 
 
 def env(name: str, default: Optional[str] = None) -> str:
@@ -83,17 +196,21 @@ def bool_env(name: str, default: bool = False) -> bool:
     return v.strip() not in ("0", "false", "False", "no", "NO", "")
 
 
-def session(token: str) -> requests.Session:
-    s = requests.Session()
-    s.headers.update(
-        {
+def session(token: str) -> httpx.Client:
+    # HTTP/2 multiplexes the worker threads' requests over a few TLS
+    # connections instead of paying a handshake per request.
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=httpx.Timeout(30.0),
+        follow_redirects=True,
+        headers={
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
             "User-Agent": "openclaw-triage-labels",
-        }
+        },
     )
-    return s
 
 
 class GitHubPermissionError(RuntimeError):
@@ -104,79 +221,218 @@ class GitHubNotFoundError(RuntimeError):
     """Raised when a GitHub API endpoint returns 404."""
 
 
-def gh_get_paginated(s: requests.Session, url: str, params: Dict[str, Any] | None = None) -> Iterable[Dict[str, Any]]:
+class GitHubRateLimitError(RuntimeError):
+    """Raised when GitHub refuses a call because a rate limit is exhausted."""
+
+
+# Per-key "next free slot" times shared by all worker threads, see wait_for_slot()
+_slot_lock = threading.Lock()
+_next_slot: Dict[str, float] = {}
+
+
+def wait_for_slot(key: str, interval: float) -> None:
+    """Block until this caller's turn in an evenly spaced schedule for `key`.
+
+    Each call reserves the next slot under a lock, so N threads together make
+    at most one call per `interval` seconds rather than N.
+    """
+    with _slot_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(key, now))
+        _next_slot[key] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+# Pacing seconds reserved so far in this run, see pace()
+_paced_seconds = 0.0
+
+
+def pace(resource: str, interval: float) -> None:
+    """Space calls against `resource` `interval` seconds apart across all threads.
+
+    Raises GitHubRateLimitError instead of reserving the slot once the run
+    has used up RATE_LIMIT_PACING_BUDGET seconds of pacing.
+    """
+    global _paced_seconds
+    key = f"rate:{resource}"
+    with _slot_lock:
+        if _paced_seconds + interval > RATE_LIMIT_PACING_BUDGET:
+            raise GitHubRateLimitError(f"{resource} rate limit nearly exhausted, pacing budget spent")
+        _paced_seconds += interval
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(key, now))
+        _next_slot[key] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def api_call(s: httpx.Client, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a GitHub API request, pacing against the rate limits.
+
+    A 403/429 is a rate limit, not a permission problem, when it carries
+    Retry-After (secondary limit) or X-RateLimit-Remaining: 0 (primary limit):
+    wait as told, or until X-RateLimit-Reset, and retry up to
+    RATE_LIMIT_RETRIES times. If the wait would exceed RATE_LIMIT_MAX_WAIT or
+    the retries run out, raise GitHubRateLimitError so callers do not report
+    the repo as inaccessible. Search requests are spaced to stay under
+    SEARCH_REQUESTS_PER_MINUTE. Once a successful answer shows fewer than
+    RATE_LIMIT_FLOOR requests left, calls against that resource are spread
+    evenly over the time left until reset, within the run's pacing budget.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if url.startswith(SEARCH_URL_PREFIX):
+            wait_for_slot("search", 60.0 / SEARCH_REQUESTS_PER_MINUTE)
+        r = s.request(method, url, **kwargs)
+        if r.status_code not in (403, 429):
+            break
+        retry_after = r.headers.get("Retry-After")
+        reset = r.headers.get("X-RateLimit-Reset")
+        if r.headers.get("X-RateLimit-Remaining") == "0":
+            delay = max(0, int(reset) - int(time.time())) + 1 if reset and reset.isdigit() else 60
+        elif retry_after:
+            delay = int(retry_after) if retry_after.isdigit() else 60
+        else:
+            return r  # a genuine 403: let the caller decide
+        resource = r.headers.get("X-RateLimit-Resource", "core")
+        if attempt >= RATE_LIMIT_RETRIES or delay > RATE_LIMIT_MAX_WAIT:
+            raise GitHubRateLimitError(f"{method} {url} - {resource} rate limit exhausted (resets in {delay}s)")
+        print(f"  (info) {method} {url} - {resource} rate limit, retrying in {delay}s")
+        time.sleep(delay)
+
+    if r.status_code < 400:
+        limit = r.headers.get("X-RateLimit-Limit")
+        remaining = r.headers.get("X-RateLimit-Remaining")
+        reset = r.headers.get("X-RateLimit-Reset")
+        if limit and remaining and reset and limit.isdigit() and remaining.isdigit() and reset.isdigit():
+            left = int(remaining)
+            if left < min(RATE_LIMIT_FLOOR, int(limit) * RATE_LIMIT_FLOOR_FRACTION):
+                interval = max(0.0, int(reset) - time.time()) / max(left, 1)
+                pace(r.headers.get("X-RateLimit-Resource", "core"), min(interval, RATE_LIMIT_MAX_WAIT))
+    return r
+
+
+def gh_get_page(
+    s: httpx.Client,
+    url: str,
+    params: Dict[str, Any] | None = None,
+    headers: Dict[str, str] | None = None,
+) -> httpx.Response:
+    """GET a single page from the GitHub API.
+
+    Raises GitHubPermissionError on 403, GitHubNotFoundError on 404 and
+    RuntimeError on any other error status. A 304 answer to a conditional
+    request is returned to the caller as-is.
+    """
+    r = api_call(s, "GET", url, params=params, headers=headers)
+    if r.status_code == 403:
+        raise GitHubPermissionError(f"GET {url} returned 403: {r.text[:200]}")
+    if r.status_code == 404:
+        raise GitHubNotFoundError(f"GET {url} returned 404: {r.text[:200]}")
+    if r.status_code >= 400:
+        raise RuntimeError(f"GET {url} failed: {r.status_code} {r.text[:200]}")
+    return r
+
+
+def next_link(r: httpx.Response) -> Optional[str]:
+    """Return the rel="next" URL from a response's Link header, if any."""
+    m = _NEXT_LINK_RE.search(r.headers.get("Link", ""))
+    return m.group(1) if m else None
+
+
+def gh_get_paginated(
+    s: httpx.Client,
+    url: Optional[str],
+    params: Dict[str, Any] | None = None,
+    items_key: Optional[str] = None,
+) -> Iterable[Dict[str, Any]]:
     """Yield items from a GitHub API endpoint that returns an array.
 
+    Endpoints that wrap the array in an object (e.g. search, under "items")
+    are handled by passing `items_key`. Pages are fetched lazily, so a
+    consumer that stops early never requests the remaining pages.
+
     Raises GitHubPermissionError on 403 and GitHubNotFoundError on 404
     so callers can handle them distinctly.
     """
     while url:
-        r = s.get(url, params=params)
+        r = gh_get_page(s, url, params=params)
         params = None  # only for first page
-        if r.status_code == 403:
-            raise GitHubPermissionError(f"GET {url} returned 403: {r.text[:200]}")
-        if r.status_code == 404:
-            raise GitHubNotFoundError(f"GET {url} returned 404: {r.text[:200]}")
-        if r.status_code >= 400:
-            raise RuntimeError(f"GET {url} failed: {r.status_code} {r.text[:200]}")
-        data = r.json()
+        data = _loads(r.content)
+        if items_key is not None and isinstance(data, dict):
+            data = data.get(items_key)
         if not isinstance(data, list):
             raise RuntimeError(f"Expected list from {url}, got {type(data)}")
         for item in data:
             yield item
+        url = next_link(r)
 
-        # parse Link header
-        link = r.headers.get("Link", "")
-        next_url = None
-        for part in link.split(","):
-            part = part.strip()
-            if 'rel="next"' in part:
-                m = re.search(r"<([^>]+)>", part)
-                if m:
-                    next_url = m.group(1)
-        url = next_url
-
-
-def ensure_label(s: requests.Session, owner: str, repo: str, name: str, color: str, description: str) -> bool:
-    """Ensure label exists. Returns True if successful, False if no permissions."""
-    # If exists -> 200; else 404
-    r = s.get(f"{API}/repos/{owner}/{repo}/labels/{name}")
-    if r.status_code == 200:
-        return True
-    if r.status_code == 403:
-        return False  # No permission, skip this repo
-    if r.status_code != 404:
-        raise RuntimeError(f"GET label {owner}/{repo}:{name} failed: {r.status_code} {r.text}")
 
-    r = s.post(
-        f"{API}/repos/{owner}/{repo}/labels",
-        json={"name": name, "color": color, "description": description},
-    )
-    if r.status_code not in (200, 201):
-        # If 403, no permission to create labels
-        if r.status_code == 403:
-            return False
-        # If it was created concurrently, GitHub may return 422. Treat as OK if label now exists.
-        r2 = s.get(f"{API}/repos/{owner}/{repo}/labels/{name}")
-        if r2.status_code == 200:
-            return True
-        raise RuntimeError(f"POST label {owner}/{repo}:{name} failed: {r.status_code} {r.text}")
-    return True
+def cache_dir() -> Path:
+    """Directory for state kept between runs.
 
+    TRIAGE_CACHE_DIR wins; in Actions $RUNNER_TEMP is used so the workflow can
+    persist it with actions/cache; otherwise ~/.cache/openclaw-triage.
+    """
+    explicit = os.environ.get("TRIAGE_CACHE_DIR")
+    if explicit:
+        return Path(explicit)
+    runner_temp = os.environ.get("RUNNER_TEMP")
+    if runner_temp:
+        return Path(runner_temp) / "openclaw-triage"
+    return Path.home() / ".cache" / "openclaw-triage"
 
-def list_repos(s: requests.Session, owner: str) -> List[Dict[str, Any]]:
+
+def load_json_cache(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            data = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_json_cache(path: Path, data: Dict[str, Any]) -> None:
+    """Write a cache file atomically. Failures are logged, never fatal."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"  (warning) could not write cache {path} - {e}")
+
+
+def list_repos(s: httpx.Client, owner: str) -> List[Dict[str, Any]]:
     """List all repos for an owner. Tries org endpoint first, falls back to user.
 
     Handles 403 (permission denied) and 404 (not found) gracefully by trying
     the next endpoint. This is important because GITHUB_TOKEN from Actions
     may not have org-level read access.
+
+    The listing is cached in cache_dir() together with the first page's ETag.
+    The next run revalidates it with If-None-Match; a 304 returns the cached
+    list without paginating and does not count against the rate limit.
     """
     org_url = f"{API}/orgs/{owner}/repos"
     user_url = f"{API}/users/{owner}/repos"
+    cache_path = cache_dir() / f"repos-{owner}.json"
+    cached = load_json_cache(cache_path)
 
     def try_url(url: str) -> Optional[List[Dict[str, Any]]]:
+        headers = None
+        if cached and cached.get("url") == url and cached.get("etag"):
+            headers = {"If-None-Match": cached["etag"]}
         try:
-            return list(gh_get_paginated(s, url, params={"per_page": 100, "type": "all"}))
+            r = gh_get_page(s, url, params={"per_page": 100, "type": "all"}, headers=headers)
+            if r.status_code == 304 and cached:
+                print(f"  (info) {url} - not modified, using cached repo list")
+                return list(cached.get("repos") or [])
+            first = _loads(r.content)
+            if not isinstance(first, list):
+                raise RuntimeError(f"Expected list from {url}, got {type(first)}")
+            repos = first + list(gh_get_paginated(s, next_link(r)))
         except (GitHubNotFoundError, GitHubPermissionError) as e:
             print(f"  (info) {url} - {e}")
             return None
@@ -185,6 +441,13 @@ def list_repos(s: requests.Session, owner: str) -> List[Dict[str, Any]]:
             print(f"  (warning) {url} - {e}")
             return None
 
+        etag = r.headers.get("ETag")
+        if etag:
+            # Only the fields main() filters on are worth keeping
+            slim = [{k: repo.get(k) for k in ("name", "archived", "fork")} for repo in repos]
+            save_json_cache(cache_path, {"url": url, "etag": etag, "repos": slim})
+        return repos
+
     repos = try_url(org_url)
     if repos is None:
         repos = try_url(user_url)
@@ -193,7 +456,147 @@ def list_repos(s: requests.Session, owner: str) -> List[Dict[str, Any]]:
     return repos
 
 
-def classify(text: str) -> str:
+def gh_graphql_partial(
+    s: httpx.Client, query: str, variables: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """POST a GraphQL query and return its `data` and `errors` as-is.
+
+    GraphQL may return partial data next to errors; this leaves it to the
+    caller to decide per field. Raises GitHubPermissionError on HTTP 403 and
+    RuntimeError on any other HTTP failure.
+    """
+    r = api_call(s, "POST", GRAPHQL_URL, json={"query": query, "variables": variables})
+    if r.status_code == 403:
+        raise GitHubPermissionError(f"POST {GRAPHQL_URL} returned 403: {r.text[:200]}")
+    if r.status_code >= 400:
+        raise RuntimeError(f"POST {GRAPHQL_URL} failed: {r.status_code} {r.text[:200]}")
+    payload = _loads(r.content)
+    return payload.get("data") or {}, payload.get("errors") or []
+
+
+def gh_graphql(s: httpx.Client, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """POST a GraphQL query and return its `data` object.
+
+    Raises GitHubPermissionError on 403 or a FORBIDDEN GraphQL error, and
+    RuntimeError on any other HTTP failure or GraphQL `errors`.
+    """
+    data, errors = gh_graphql_partial(s, query, variables)
+    if errors:
+        messages = "; ".join(str(e.get("message", e)) for e in errors)
+        if any(e.get("type") == "RATE_LIMITED" for e in errors):
+            raise GitHubRateLimitError(f"GraphQL rate limit exhausted: {messages[:200]}")
+        if any(e.get("type") == "FORBIDDEN" for e in errors):
+            raise GitHubPermissionError(f"GraphQL request forbidden: {messages[:200]}")
+        raise RuntimeError(f"GraphQL query failed: {messages[:200]}")
+    return data
+
+
+def untriaged_issues_query(owner: str, repo: str) -> str:
+    """Search query for the open issues of a repo that have no bug/security label yet."""
+    return f"repo:{owner}/{repo} is:issue is:open -label:bug -label:security"
+
+
+def _issues_from_connection(conn: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a GraphQL issues or search connection into REST-shaped issue dicts."""
+    issues = []
+    for issue in conn.get("nodes") or []:
+        if not issue or "id" not in issue:
+            continue
+        labels = (issue.get("labels") or {}).get("nodes") or []
+        issues.append(
+            {
+                "id": issue["id"],
+                "number": issue["number"],
+                "title": issue.get("title"),
+                "body": issue.get("body"),
+                "labels": [{"name": lbl.get("name")} for lbl in labels if lbl],
+            }
+        )
+    return issues
+
+
+def _search_untriaged_first_pages(
+    s: httpx.Client, owner: str, names: List[str], n: int
+) -> List[Dict[str, Any]]:
+    """Return the first search page of untriaged issues for each repo in `names`."""
+    fields = "\n".join(
+        f"  r{i}: search(type: ISSUE, query: {json.dumps(untriaged_issues_query(owner, name) + ' sort:created-desc')}, "
+        "first: $n) { nodes { ...TriageIssue } pageInfo { endCursor hasNextPage } }"
+        for i, name in enumerate(names)
+    )
+    data = gh_graphql(s, TRIAGE_ISSUE_FIELDS + f"query($n: Int!) {{\n{fields}\n}}", {"n": n})
+    return [data.get(f"r{i}") or {} for i in range(len(names))]
+
+
+def fetch_triage_data_graphql(
+    s: httpx.Client,
+    owner: str,
+    prefix: str,
+    limit: int,
+    skip_forks: bool = True,
+    skip_archived: bool = True,
+) -> List[Dict[str, Any]]:
+    """Fetch repos and their untriaged open issues for an owner in as few requests as possible.
+
+    Returns one dict per matching repo, sorted by name, shaped like the REST
+    payloads the rest of the script consumes: {"name": ..., "issues": [...]}
+    where each issue has number, title, body and labels=[{"name": ...}].
+    Issues already labelled bug or security are left out by the search.
+    GraphQL node ids are included as issue["id"] and as
+    repo["label_ids"][label] (None when the label does not exist yet) so
+    labels can be applied with add_labels_bulk().
+    """
+    variables: Dict[str, Any] = {
+        "login": owner,
+        "cursor": None,
+        # null disables the filter, matching SKIP_FORKS=0 / SKIP_ARCHIVED=0
+        "isFork": False if skip_forks else None,
+        "isArchived": False if skip_archived else None,
+    }
+    repos: List[Dict[str, Any]] = []
+    while True:
+        data = gh_graphql(s, TRIAGE_QUERY, variables)
+        repo_owner = data.get("repositoryOwner")
+        if repo_owner is None:
+            raise GitHubNotFoundError(f"GraphQL: no user or organization named {owner}")
+        conn = repo_owner["repositories"]
+        for node in conn.get("nodes") or []:
+            if not node or not node.get("name", "").startswith(prefix):
+                continue
+            label_ids = {name: (node.get(alias) or {}).get("id") for name, alias in LABEL_ALIASES.items()}
+            repos.append({"name": node["name"], "issues": [], "label_ids": label_ids})
+        page = conn.get("pageInfo") or {}
+        if not page.get("hasNextPage"):
+            break
+        variables["cursor"] = page.get("endCursor")
+
+    repos.sort(key=lambda r: r["name"])
+
+    page_size = max(1, min(limit, 100))
+    for start in range(0, len(repos), ISSUE_SEARCH_BATCH):
+        chunk = repos[start : start + ISSUE_SEARCH_BATCH]
+        first_pages = _search_untriaged_first_pages(s, owner, [r["name"] for r in chunk], page_size)
+        for repo, issues_conn in zip(chunk, first_pages):
+            issues = _issues_from_connection(issues_conn)
+            issues_page = issues_conn.get("pageInfo") or {}
+            while len(issues) < limit and issues_page.get("hasNextPage"):
+                more = gh_graphql(
+                    s,
+                    SEARCH_ISSUES_QUERY,
+                    {
+                        "q": untriaged_issues_query(owner, repo["name"]) + " sort:created-desc",
+                        "n": min(page_size, limit - len(issues)),
+                        "cursor": issues_page.get("endCursor"),
+                    },
+                )
+                issues_conn = more.get("search") or {}
+                issues.extend(_issues_from_connection(issues_conn))
+                issues_page = issues_conn.get("pageInfo") or {}
+            repo["issues"] = issues[:limit]
+    return repos
+
+
+def _classify(text: str) -> str:
     t = text.lower()
     if any(k in t for k in SECURITY_KEYWORDS):
         return "security"
@@ -202,12 +605,100 @@ def classify(text: str) -> str:
     return "needs-triage"
 
 
-def add_label(s: requests.Session, owner: str, repo: str, issue_number: int, label: str) -> bool:
-    """Add label to issue. Returns True if successful, False if no permissions."""
-    r = s.post(
-        f"{API}/repos/{owner}/{repo}/issues/{issue_number}/labels",
-        json={"labels": [label]},
+# classify() results keyed by a short digest of the text rather than the text
+# itself, so copy-pasted issues across repos are scanned once without the
+# cache pinning large bodies in memory. Oldest entries are evicted first.
+CLASSIFY_CACHE_SIZE = 4096
+_classify_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_classify_lock = threading.Lock()
+
+
+def classify(text: str) -> str:
+    key = hashlib.blake2s(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    label = _classify_cache.get(key)
+    if label is None:
+        label = _classify(text)
+        with _classify_lock:
+            _classify_cache[key] = label
+            if len(_classify_cache) > CLASSIFY_CACHE_SIZE:
+                _classify_cache.popitem(last=False)
+    return label
+
+
+# create_label() results per (owner, repo, label) for this run, so a label is
+# created at most once no matter how many issues hit a 422 for it.
+_created_labels: Dict[Tuple[str, str, str], Optional[Dict[str, Any]]] = {}
+
+
+def create_label(s: httpx.Client, owner: str, repo: str, name: str) -> Optional[Dict[str, Any]]:
+    """Create one of the LABELS in a repo. Returns the label, or None if no permissions."""
+    key = (owner, repo, name)
+    if key in _created_labels:
+        return _created_labels[key]
+
+    meta = LABELS[name]
+    r = api_call(
+        s,
+        "POST",
+        f"{API}/repos/{owner}/{repo}/labels",
+        json={"name": name, "color": meta["color"], "description": meta["description"]},
     )
+    if r.status_code in (200, 201):
+        label = _loads(r.content)
+    elif r.status_code == 403:
+        label = None
+    else:
+        # 422 means the label already exists (e.g. created concurrently)
+        if r.status_code == 422:
+            r = api_call(s, "GET", f"{API}/repos/{owner}/{repo}/labels/{name}")
+        if r.status_code != 200:
+            raise RuntimeError(f"POST label {owner}/{repo}:{name} failed: {r.status_code} {r.text}")
+        label = _loads(r.content)
+    _created_labels[key] = label
+    return label
+
+
+def label_missing(r: httpx.Response) -> bool:
+    """Tell whether a 422 from the add-labels endpoint means the label does not exist.
+
+    Checks the structured `errors` entries (code "missing" on the Label
+    resource, or a message saying the label does not exist / was not found)
+    and the top-level message. Any other 422 is left to the caller.
+    """
+    try:
+        body = _loads(r.content)
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+
+    def says_missing(message: Any) -> bool:
+        m = str(message or "").lower()
+        return "label" in m and ("does not exist" in m or "not found" in m)
+
+    for e in body.get("errors") or []:
+        if isinstance(e, dict):
+            if e.get("code") == "missing" and str(e.get("resource", "")).lower() == "label":
+                return True
+            if says_missing(e.get("message")):
+                return True
+        elif says_missing(e):
+            return True
+    return says_missing(body.get("message"))
+
+
+def add_label(s: httpx.Client, owner: str, repo: str, issue_number: int, label: str) -> bool:
+    """Add label to issue. Returns True if successful, False if no permissions.
+
+    Labels are assumed to exist; if GitHub rejects the request with a 422
+    saying the label does not exist, it is created once and the add retried.
+    """
+    url = f"{API}/repos/{owner}/{repo}/issues/{issue_number}/labels"
+    r = api_call(s, "POST", url, json={"labels": [label]})
+    if r.status_code == 422 and label_missing(r):
+        if create_label(s, owner, repo, label) is None:
+            return False
+        r = api_call(s, "POST", url, json={"labels": [label]})
     if r.status_code not in (200, 201):
         if r.status_code == 403:
             return False  # No permission
@@ -215,6 +706,284 @@ def add_label(s: requests.Session, owner: str, repo: str, issue_number: int, lab
     return True
 
 
+def add_labels_bulk(
+    s: httpx.Client, mutations: List[Tuple[str, str]]
+) -> Tuple[List[bool], Optional[Exception]]:
+    """Apply (labelable node id, label node id) pairs via GraphQL.
+
+    Pairs are sent as aliased addLabelsToLabelable mutations (m0, m1, ...),
+    ADD_LABELS_BATCH per request, and each alias is checked on its own.
+    Returns (applied, error): applied[i] tells whether pair i was labelled.
+    error is set when a request failed outright, hit a rate limit
+    (GitHubRateLimitError) or GitHub refused a mutation for lack of
+    permission (GitHubPermissionError); later chunks are not sent then, but
+    everything applied so far is still reported.
+    """
+    applied = [False] * len(mutations)
+    for start in range(0, len(mutations), ADD_LABELS_BATCH):
+        chunk = mutations[start : start + ADD_LABELS_BATCH]
+        fields = "\n".join(
+            f"  m{i}: addLabelsToLabelable(input: {{labelableId: {json.dumps(labelable_id)}, "
+            f"labelIds: [{json.dumps(label_id)}]}}) {{ clientMutationId }}"
+            for i, (labelable_id, label_id) in enumerate(chunk)
+        )
+        try:
+            data, errors = gh_graphql_partial(s, f"mutation {{\n{fields}\n}}", {})
+        except (RuntimeError, httpx.HTTPError) as e:
+            return applied, e
+
+        failed = {}
+        for e in errors:
+            path = e.get("path") or []
+            failed[path[0] if path else None] = e
+        for i in range(len(chunk)):
+            alias = f"m{i}"
+            applied[start + i] = alias not in failed and data.get(alias) is not None
+
+        rate_limited = [e for e in errors if e.get("type") == "RATE_LIMITED"]
+        if rate_limited:
+            return applied, GitHubRateLimitError(f"GraphQL rate limit exhausted: {rate_limited[0].get('message')}")
+        forbidden = [e for e in errors if e.get("type") == "FORBIDDEN"]
+        if forbidden:
+            return applied, GitHubPermissionError(f"GraphQL mutation forbidden: {forbidden[0].get('message')}")
+        if None in failed:
+            # An error not tied to any alias (e.g. a query-level failure)
+            return applied, RuntimeError(f"GraphQL mutation failed: {failed[None].get('message')}")
+    return applied, None
+
+
+def http_date(iso: str) -> str:
+    """Convert a GitHub ISO 8601 timestamp to the RFC 1123 form HTTP headers use."""
+    dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def valid_timestamp(value: Any) -> bool:
+    """Tell whether a saved triage-state value is a timestamp http_date() accepts."""
+    if not isinstance(value, str):
+        return False
+    try:
+        http_date(value)
+    except ValueError:
+        return False
+    return True
+
+
+def freshness_after_run(
+    s: httpx.Client,
+    owner: str,
+    repo: str,
+    since: Optional[str],
+    processed: List[Dict[str, Any]],
+    per_repo_limit: int,
+) -> Optional[str]:
+    """Return the timestamp to store for `repo` after a REST pass, or None to keep the old one.
+
+    Read after labelling, so the updated_at bumps caused by our own labels
+    are already included and the next run can get a 304. Every open issue
+    changed since `since` must be accounted for: a PR, already labelled
+    bug/security, returned by the search (`processed`), or created before
+    the search's per_repo_limit cutoff. Anything else was most likely not in
+    the search index yet, so the timestamp is not advanced and the next run
+    searches again.
+    """
+    params: Dict[str, Any] = {"state": "open", "sort": "updated", "direction": "desc", "per_page": 100}
+    if since:
+        params["since"] = since
+    changed = list(gh_get_paginated(s, f"{API}/repos/{owner}/{repo}/issues", params=params))
+
+    seen = {item.get("number") for item in processed}
+    cutoff = None
+    if len(processed) >= per_repo_limit:
+        cutoff = min((item.get("created_at") or "" for item in processed), default="") or None
+    for item in changed:
+        names = {lbl.get("name") for lbl in item.get("labels", []) if isinstance(lbl, dict)}
+        if "pull_request" in item or "bug" in names or "security" in names or item.get("number") in seen:
+            continue
+        if cutoff and (item.get("created_at") or "") < cutoff:
+            continue
+        return None
+    return max((item.get("updated_at") or "" for item in changed), default="") or since
+
+
+def process_repo(
+    s: httpx.Client,
+    owner: str,
+    r: Dict[str, Any],
+    per_repo_limit: int,
+    state: Dict[str, str],
+) -> Tuple[str, Counts, Optional[str]]:
+    """Classify and label the open issues of one repo.
+
+    Returns (repo name, label counts, skip reason). The skip reason is None
+    when the repo was processed; otherwise it says why the repo was skipped
+    (RATE_LIMITED when GitHub's rate limit ran out).
+    Never raises, so a single repo cannot crash the entire triage run.
+
+    On the REST path `state` maps repo name to the newest issue `updated_at`
+    seen by a previous run. It is sent as If-Modified-Since so unchanged
+    repos cost one 304, and it is updated after a successful pass via
+    freshness_after_run().
+    """
+    repo = r["name"]
+    c = new_counts()
+
+    try:
+        # Labels are assumed to exist on both paths and created on first use.
+        # GraphQL fast path: issues are already here and labels are applied
+        # in bulk afterwards.
+        bulk = "issues" in r
+        pending: List[Tuple[str, str]] = []
+        if bulk:
+            items = r["issues"]
+        else:
+            # Cheap change probe: a 304 here does not count against the rate
+            # limit and spares the (scarcer) search quota below.
+            since = state.get(repo)
+            try:
+                probe = gh_get_page(
+                    s,
+                    f"{API}/repos/{owner}/{repo}/issues",
+                    params={"state": "open", "sort": "updated", "direction": "desc", "per_page": 1},
+                    headers={"If-Modified-Since": http_date(since)} if since else None,
+                )
+            except (GitHubPermissionError, GitHubNotFoundError):
+                reason = "insufficient permissions to list issues"
+                print(f"  [SKIP] {owner}/{repo}: {reason}")
+                return repo, c, reason
+            if probe.status_code == 304:
+                return repo, c, None
+            if not _loads(probe.content):
+                return repo, c, None  # no open issues at all
+
+            # Same server-side filter as the GraphQL path, see
+            # SEARCH_ISSUES_QUERY. Pages are capped at 100 items; islice stops
+            # paginating as soon as per_repo_limit issues have been read.
+            try:
+                items = list(
+                    islice(
+                        gh_get_paginated(
+                            s,
+                            f"{API}/search/issues",
+                            params={
+                                "q": untriaged_issues_query(owner, repo),
+                                "sort": "created",
+                                "order": "desc",
+                                "per_page": max(1, min(per_repo_limit, 100)),
+                            },
+                            items_key="items",
+                        ),
+                        per_repo_limit,
+                    )
+                )
+            except GitHubRateLimitError:
+                raise
+            except (GitHubPermissionError, GitHubNotFoundError):
+                reason = "insufficient permissions to list issues"
+                print(f"  [SKIP] {owner}/{repo}: {reason}")
+                return repo, c, reason
+            except RuntimeError as e:
+                # e.g. search answers 422 for repos the token cannot see
+                reason = f"list issues failed, skipping - {e}"
+                print(f"  [WARN] {owner}/{repo}: {reason}")
+                return repo, c, reason
+
+        for item in items:
+            if "pull_request" in item:
+                continue
+
+            number = int(item["number"])
+            title = item.get("title") or ""
+            body = item.get("body") or ""
+            existing = {lbl.get("name") for lbl in item.get("labels", []) if isinstance(lbl, dict)}
+
+            # Skip if already triaged as bug/security
+            if "bug" in existing or "security" in existing:
+                continue
+
+            label = classify(f"{title}\n{body}")
+            if bulk:
+                pending.append((item["id"], label))
+                continue
+            if not add_label(s, owner, repo, number, label):
+                reason = "insufficient permissions (cannot add labels)"
+                print(f"  [SKIP] {owner}/{repo}: {reason}")
+                return repo, c, reason
+            c[CAT_IDX[label]] += 1
+
+        if pending:
+            label_ids = dict(r.get("label_ids") or {})
+            for name in sorted({label for _, label in pending}):
+                if label_ids.get(name):
+                    continue
+                created = create_label(s, owner, repo, name)
+                if created is None:
+                    reason = "insufficient permissions (cannot manage labels)"
+                    print(f"  [SKIP] {owner}/{repo}: {reason}")
+                    return repo, c, reason
+                label_ids[name] = created["node_id"]
+
+            applied, error = add_labels_bulk(s, [(issue_id, label_ids[label]) for issue_id, label in pending])
+            for ok, (_, label) in zip(applied, pending):
+                if ok:
+                    c[CAT_IDX[label]] += 1
+            if isinstance(error, GitHubPermissionError):
+                reason = "insufficient permissions (cannot add labels)"
+                print(f"  [SKIP] {owner}/{repo}: {reason}")
+                return repo, c, reason
+            if error is not None:
+                raise error
+            if not all(applied):
+                print(f"  [WARN] {owner}/{repo}: {applied.count(False)} label mutation(s) failed")
+
+        if not bulk:
+            fresh = freshness_after_run(s, owner, repo, since, items, per_repo_limit)
+            if fresh:
+                state[repo] = fresh
+
+    except GitHubRateLimitError as exc:
+        print(f"  [SKIP] {owner}/{repo}: {exc}")
+        return repo, c, RATE_LIMITED
+    except Exception as exc:
+        print(f"  [ERROR] {owner}/{repo}: {exc}")
+        return repo, c, str(exc)
+
+    return repo, c, None
+
+
+def iter_nonzero(per_repo: Dict[str, Counts]) -> Iterable[Tuple[str, Counts]]:
+    """Yield (repo, counts) for repos that got at least one label, in insertion order."""
+    for repo, c in per_repo.items():
+        if any(c):
+            yield repo, c
+
+
+def build_summary_bytes(
+    owner: str,
+    repos_scanned: int,
+    skipped_repos: List[str],
+    rate_limited_repos: List[str],
+    total: Counts,
+    rows: List[Tuple[str, Counts]],
+) -> bytes:
+    """Render the GITHUB_STEP_SUMMARY markdown as UTF-8, ready for a single binary write."""
+    parts = ["## OpenClaw triage (labeling-only)\n\n", f"Repos scanned: **{repos_scanned}**\n\n"]
+    if skipped_repos:
+        parts.append(f"Repos skipped (no access): **{len(skipped_repos)}** - {', '.join(skipped_repos)}\n\n")
+    if rate_limited_repos:
+        parts.append(
+            f"Repos skipped (rate limited): **{len(rate_limited_repos)}** - {', '.join(rate_limited_repos)}\n\n"
+        )
+    parts.append(
+        f"Labeled total: **security={total[SECURITY]}**, **bug={total[BUG]}**, **needs-triage={total[NEEDS_TRIAGE]}**\n\n"
+    )
+    parts.append("### Per repo (non-zero)\n\n")
+    parts.extend(
+        f"- `{owner}/{repo}`: security={c[SECURITY]}, bug={c[BUG]}, needs-triage={c[NEEDS_TRIAGE]}\n" for repo, c in rows
+    )
+    return "".join(parts).encode("utf-8")
+
+
 def main() -> int:
     # Prefer TRIAGE_GH_TOKEN (cross-repo PAT); fall back to GITHUB_TOKEN (single-repo).
     triage_token = os.environ.get("TRIAGE_GH_TOKEN")
@@ -237,119 +1006,85 @@ def main() -> int:
 
     # sanity check auth - use /octocat for installation tokens (doesn't require user scope)
     # The /user endpoint requires user-level access which GitHub Actions GITHUB_TOKEN doesn't have
-    auth_check = s.get(f"{API}/octocat")
+    auth_check = api_call(s, "GET", f"{API}/octocat")
     if auth_check.status_code >= 400:
         raise RuntimeError(f"Auth check failed: {auth_check.status_code} {auth_check.text}")
 
-    repos = list_repos(s, owner)
-    repos = [r for r in repos if r.get("name", "").startswith(prefix)]
-    if skip_archived:
-        repos = [r for r in repos if not r.get("archived", False)]
-    if skip_forks:
-        repos = [r for r in repos if not r.get("fork", False)]
-
-    repos.sort(key=lambda r: r.get("name", ""))
+    # Fast path: a single paginated GraphQL query returns repos with their open
+    # issues and labels. Fall back to per-repo REST calls if it is unavailable.
+    repos: Optional[List[Dict[str, Any]]] = None
+    try:
+        repos = fetch_triage_data_graphql(s, owner, prefix, per_repo_limit, skip_forks, skip_archived)
+        print(f"discovery: graphql ({len(repos)} repos)")
+    except (RuntimeError, httpx.HTTPError) as e:
+        # httpx.HTTPError covers timeouts/transport errors on the large query
+        print(f"  (warning) GraphQL discovery failed, falling back to REST - {e}")
 
-    total = Counts()
-    per_repo: Dict[str, Counts] = {}
-    skipped_repos: List[str] = []
+    if repos is None:
+        repos = list_repos(s, owner)
+        repos = [r for r in repos if r.get("name", "").startswith(prefix)]
+        if skip_archived:
+            repos = [r for r in repos if not r.get("archived", False)]
+        if skip_forks:
+            repos = [r for r in repos if not r.get("fork", False)]
 
-    for r in repos:
-        repo = r["name"]
-        per_repo[repo] = Counts()
+    repos.sort(key=lambda r: r.get("name", ""))
 
-        try:
-            # Ensure labels exist (check permissions first)
-            has_access = True
-            for lname, meta in LABELS.items():
-                if not ensure_label(s, owner, repo, lname, meta["color"], meta["description"]):
-                    has_access = False
-                    break
-
-            if not has_access:
-                print(f"  [SKIP] {owner}/{repo}: insufficient permissions (cannot manage labels)")
-                skipped_repos.append(repo)
-                continue
+    # Per-repo issue freshness from the previous run (REST path only)
+    state_path = cache_dir() / f"triage-state-{owner}.json"
+    saved_state = load_json_cache(state_path) or {}
+    # Drop corrupted or hand-edited entries: those repos are treated as never
+    # seen, and the rewritten file no longer carries the bad values.
+    state = {k: v for k, v in saved_state.items() if valid_timestamp(v)}
 
-            # Fetch open issues (GitHub's /issues includes PRs; filter them)
-            issues = s.get(
-                f"{API}/repos/{owner}/{repo}/issues",
-                params={"state": "open", "per_page": per_repo_limit, "sort": "created", "direction": "desc"},
-            )
-            if issues.status_code == 403:
-                print(f"  [SKIP] {owner}/{repo}: insufficient permissions to list issues")
-                skipped_repos.append(repo)
-                continue
-            if issues.status_code >= 400:
-                print(f"  [WARN] {owner}/{repo}: list issues returned {issues.status_code}, skipping")
-                skipped_repos.append(repo)
-                continue
-            items = issues.json()
-            if not isinstance(items, list):
-                print(f"  [WARN] {owner}/{repo}: unexpected response from issues endpoint, skipping")
+    # Repos are independent, so fan the per-repo work out over a small thread
+    # pool. Keep it bounded to stay clear of GitHub's secondary rate limits.
+    concurrency = max(1, int(os.environ.get("TRIAGE_CONCURRENCY", "8")))
+    # Pre-seeded in the (sorted) repo order so the summary can iterate it
+    # without sorting again, whatever order the workers finish in.
+    per_repo: Dict[str, Counts] = {r["name"]: new_counts() for r in repos}
+    skipped_repos: List[str] = []
+    rate_limited_repos: List[str] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        futures = [ex.submit(process_repo, s, owner, r, per_repo_limit, state) for r in repos]
+        for f in as_completed(futures):
+            repo, c, skip = f.result()
+            per_repo[repo] = c
+            if skip == RATE_LIMITED:
+                rate_limited_repos.append(repo)
+            elif skip is not None:
                 skipped_repos.append(repo)
-                continue
+    skipped_repos.sort()
+    rate_limited_repos.sort()
+    if state != saved_state:
+        save_json_cache(state_path, state)
 
-            for item in items:
-                if "pull_request" in item:
-                    continue
-
-                number = int(item["number"])
-                title = item.get("title") or ""
-                body = item.get("body") or ""
-                existing = {lbl.get("name") for lbl in item.get("labels", []) if isinstance(lbl, dict)}
-
-                # Skip if already triaged as bug/security
-                if "bug" in existing or "security" in existing:
-                    continue
-
-                label = classify(f"{title}\n{body}")
-                if add_label(s, owner, repo, number, label):
-                    c = per_repo[repo]
-                    if label == "security":
-                        c.security += 1
-                        total.security += 1
-                    elif label == "bug":
-                        c.bug += 1
-                        total.bug += 1
-                    else:
-                        c.needs_triage += 1
-                        total.needs_triage += 1
-
-        except Exception as exc:
-            # Never let a single repo crash the entire triage run
-            print(f"  [ERROR] {owner}/{repo}: {exc}")
-            skipped_repos.append(repo)
+    total = new_counts()
+    for c in per_repo.values():
+        for i, n in enumerate(c):
+            total[i] += n
 
     # Print a GitHub Actions-friendly summary
-    print("\n== openclaw triage summary ==")
-    print(f"repos scanned: {len(repos)}")
+    lines = ["\n== openclaw triage summary ==\n", f"repos scanned: {len(repos)}\n"]
     if skipped_repos:
-        print(f"repos skipped (no access): {len(skipped_repos)} - {', '.join(skipped_repos)}")
-        print("  Hint: set TRIAGE_GH_TOKEN secret with a fine-grained PAT for cross-repo access.")
-    print(f"labeled total: security={total.security}, bug={total.bug}, needs-triage={total.needs_triage}")
-    print("\nPer repo:")
-    for repo in sorted(per_repo.keys()):
-        c = per_repo[repo]
-        if c.security or c.bug or c.needs_triage:
-            print(f"- {owner}/{repo}: security={c.security}, bug={c.bug}, needs-triage={c.needs_triage}")
+        lines.append(f"repos skipped (no access): {len(skipped_repos)} - {', '.join(skipped_repos)}\n")
+        lines.append("  Hint: set TRIAGE_GH_TOKEN secret with a fine-grained PAT for cross-repo access.\n")
+    if rate_limited_repos:
+        lines.append(f"repos skipped (rate limited): {len(rate_limited_repos)} - {', '.join(rate_limited_repos)}\n")
+    lines.append(f"labeled total: security={total[SECURITY]}, bug={total[BUG]}, needs-triage={total[NEEDS_TRIAGE]}\n")
+    lines.append("\nPer repo:\n")
+    rows = list(iter_nonzero(per_repo))
+    lines.extend(
+        f"- {owner}/{repo}: security={c[SECURITY]}, bug={c[BUG]}, needs-triage={c[NEEDS_TRIAGE]}\n" for repo, c in rows
+    )
+    sys.stdout.write("".join(lines))
 
     # Also write to the job summary if available
     summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
     if summary_path:
-        with open(summary_path, "a", encoding="utf-8") as f:
-            f.write("## OpenClaw triage (labeling-only)\n\n")
-            f.write(f"Repos scanned: **{len(repos)}**\n\n")
-            if skipped_repos:
-                f.write(f"Repos skipped (no access): **{len(skipped_repos)}** - {', '.join(skipped_repos)}\n\n")
-            f.write(
-                f"Labeled total: **security={total.security}**, **bug={total.bug}**, **needs-triage={total.needs_triage}**\n\n"
-            )
-            f.write("### Per repo (non-zero)\n\n")
-            for repo in sorted(per_repo.keys()):
-                c = per_repo[repo]
-                if c.security or c.bug or c.needs_triage:
-                    f.write(f"- `{owner}/{repo}`: security={c.security}, bug={c.bug}, needs-triage={c.needs_triage}\n")
+        body = build_summary_bytes(owner, len(repos), skipped_repos, rate_limited_repos, total, rows)
+        with open(summary_path, "ab") as f:
+            f.write(body)
 
     return 0
 